@@ -0,0 +1,154 @@
+##  -*- coding: UTF8 -*-
+## _utils.py
+## Copyright (c) 2020 libcommon
+##
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+try:
+    from asyncio import current_task
+except ImportError:
+    # NOTE: asyncio.current_task was added in Python 3.7
+    from asyncio import Task
+    current_task = Task.current_task  # type: ignore[attr-defined]  # pylint: disable=no-member
+from functools import lru_cache
+from threading import get_ident
+from typing import Any, Dict, Tuple, Type, TYPE_CHECKING
+
+from sqlalchemy.event import contains, listen
+from sqlalchemy.orm.query import Query
+from sqlalchemy.pool import Pool, QueuePool, SingletonThreadPool
+
+# NOTE: Only imported for type hints, which reference them by name (string annotations)
+if TYPE_CHECKING:
+    from sqlalchemy import MetaData
+    from sqlalchemy.engine import Dialect
+
+
+__author__ = "libcommon"
+
+
+def _current_task_scope() -> Any:
+    """
+    Args:
+        N/A
+    Description:
+        Scope function for task-scoped sessions. Returns current asyncio Task,
+        or current thread identifier if not called from within a Task.
+        See: https://docs.sqlalchemy.org/en/13/orm/contextual.html#using-custom-created-scopes
+    Preconditions:
+        N/A
+    Raises:
+        N/A
+    """
+    try:
+        task = current_task()
+    except RuntimeError:
+        # No running event loop
+        task = None
+    return task if task is not None else get_ident()
+
+
+# Pool sizing arguments of DBManager.create_engine (by Engine argument name) supported by each pool class,
+# other than QueuePool (and subclasses), which supports all of them
+_POOL_SIZING_KWARGS = ("pool_size", "max_overflow", "pool_timeout", "pool_use_lifo")
+_POOL_SIZING_KWARGS_BY_POOLCLASS = ((SingletonThreadPool, ("pool_size",)),)
+
+
+def _check_pool_sizing_kwargs(poolclass: Type[Pool], pool_kwargs: Dict[str, Any]) -> None:
+    """
+    Args:
+        poolclass   => pool class selected for Engine
+        pool_kwargs => pool arguments passed to DBManager.create_engine (by Engine argument name),
+                       None if not passed
+    Description:
+        Ensure each pool sizing argument passed explicitly is supported by poolclass.
+        QueuePool supports all of them, SingletonThreadPool only pool_size, and other
+        pool classes (like NullPool and StaticPool) none (see: DBManager.create_engine).
+    Preconditions:
+        N/A
+    Raises:
+        ValueError: if a pool sizing argument is passed and isn't supported by poolclass
+    """
+    if issubclass(poolclass, QueuePool):
+        return
+    supported = next((names for base, names in _POOL_SIZING_KWARGS_BY_POOLCLASS if issubclass(poolclass, base)), ())
+    for name in _POOL_SIZING_KWARGS:
+        if name not in supported and pool_kwargs.get(name) is not None:
+            raise ValueError("{} isn't supported by {}".format("use_lifo" if name == "pool_use_lifo" else name,
+                                                               poolclass.__name__))
+
+
+@lru_cache(maxsize=256)
+def _compile_query_sql(model: Any, dialect: "Dialect", filters: Tuple[Tuple[str, type, Any], ...]) -> str:
+    """
+    Args:
+        model   => model of table to query
+        dialect => SQL dialect to compile query for
+        filters => (column name, value type, value) triples to build WHERE clause from
+    Description:
+        Compile SELECT statement for model with WHERE clause built from filters,
+        with values rendered inline. Cached by arguments (see: DBManager.query_sql).
+        NOTE: Value types are part of the cache key, as equal values of different types
+              (like 1 and True) share a hash but may render differently.
+    Preconditions:
+        N/A
+    Raises:
+        N/A
+    """
+    statement = Query(model).filter_by(**{key: value for key, _, value in filters}).statement
+    return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+_DROP_COUNT_INFO_KEY = "lc_sqlalchemy_dbutils.drop_count"
+
+
+def _count_drop(target: "MetaData", connection: Any, **kwargs) -> None:
+    """
+    Args:
+        target      => metadata whose tables were dropped
+        connection  => connection tables were dropped with
+        kwargs      => passed by SQLAlchemy event dispatch
+    Description:
+        MetaData after_drop event listener that increments the number of times
+        all tables of target have been dropped, stored in target.info (see: _drop_count).
+    Preconditions:
+        N/A
+    Raises:
+        N/A
+    """
+    # pylint: disable=unused-argument
+    target.info[_DROP_COUNT_INFO_KEY] = target.info.get(_DROP_COUNT_INFO_KEY, 0) + 1
+
+
+def _drop_count(metadata: "MetaData") -> int:
+    """
+    Args:
+        metadata    => metadata to count drop_all calls for
+    Description:
+        Return number of times drop_all has been called on metadata since first call,
+        installing the after_drop listener that counts them if not already installed.
+        Lets callers detect that tables created earlier may no longer exist (see: DBManager.connect).
+    Preconditions:
+        N/A
+    Raises:
+        N/A
+    """
+    if not contains(metadata, "after_drop", _count_drop):
+        listen(metadata, "after_drop", _count_drop)
+    return metadata.info.get(_DROP_COUNT_INFO_KEY, 0)
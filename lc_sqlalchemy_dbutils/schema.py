@@ -21,7 +21,8 @@
 ## SOFTWARE.
 # pylint: disable=W0613
 
-import os
+from typing import Any, List
+import warnings
 
 from sqlalchemy.engine.interfaces import Compiled
 from sqlalchemy.ext.compiler import compiles
@@ -36,28 +37,33 @@ class TimestampDefaultExpression(ClauseElement):
     expressions based on SQL dialect. To be used with
     the `server_default` parameter in the sqlalchemy.schema.Column
     constructor.
+    NOTE: The timestamp is only guaranteed to be in UTC for the dialects
+    listed in _TS_BY_DIALECT. Other dialects fall back to the ANSI SQL
+    CURRENT_TIMESTAMP, which is in the database (or session) time zone
+    on many backends, and emit a warning when compiled.
     """
+    # NOTE: Expression has no state, so its class alone identifies it to SQLAlchemy's (1.4+)
+    # compiled statement cache, which is otherwise disabled for statements containing it
+    inherit_cache = True
+    _traverse_internals: List[Any] = []
 
-@compiles(TimestampDefaultExpression, "mssql")
-def generate_timestamp_expression_mssql(element: TimestampDefaultExpression, compiler: Compiled, **kwargs):
-    return "GETUTCDATE()"
+# Server default timestamp expression by SQL dialect name
+# NOTE: Dialects not listed here fall back to the ANSI SQL CURRENT_TIMESTAMP, which isn't necessarily UTC
+_TS_BY_DIALECT = {
+    "mssql": "GETUTCDATE()",
+    "mysql": "UTC_TIMESTAMP()",
+    "oracle": "SYS_EXTRACT_UTC(SYSTIMESTAMP)",
+    "postgresql": "(NOW() AT TIME ZONE 'UTC')",
+    "sqlite": "CURRENT_TIMESTAMP",
+}
 
-@compiles(TimestampDefaultExpression, "mysql")
-def generate_timestamp_expression_mysql(element: TimestampDefaultExpression, compiler: Compiled, **kwargs):
-    return "UTC_TIMESTAMP()"
 
-@compiles(TimestampDefaultExpression, "oracle")
-def generate_timestamp_expression_oracle(element: TimestampDefaultExpression, compiler: Compiled, **kwargs):
-    return "SYS_EXTRACT_UTC(SYSTIMESTAMP)"
-
-@compiles(TimestampDefaultExpression, "postgresql")
-def generate_timestamp_expression_pgsql(element: TimestampDefaultExpression, compiler: Compiled, **kwargs):
-    return "(NOW() AT TIME ZONE 'UTC')"
-
-@compiles(TimestampDefaultExpression, "sqlite")
-def generate_timestamp_expression_sqlite(element: TimestampDefaultExpression, compiler: Compiled, **kwargs):
-    return "CURRENT_TIMESTAMP"
-
-
-if os.environ.get("ENVIRONMENT") == "TEST":
-    import unittest
+@compiles(TimestampDefaultExpression)
+def generate_timestamp_expression(element: TimestampDefaultExpression, compiler: Compiled, **kwargs) -> str:
+    expression = _TS_BY_DIALECT.get(compiler.dialect.name)
+    if expression is None:
+        warnings.warn("No UTC timestamp expression for dialect {}, "
+                      "falling back to CURRENT_TIMESTAMP (which may not be UTC)".format(compiler.dialect.name),
+                      RuntimeWarning)
+        expression = "CURRENT_TIMESTAMP"
+    return expression
@@ -21,7 +21,7 @@
 ## SOFTWARE.
 # pylint: disable=W0613
 
-import os
+from typing import Any, List, Optional, Tuple
 
 from sqlalchemy import Column
 from sqlalchemy.engine.interfaces import Compiled
@@ -45,9 +45,8 @@ class CreateViewExpression(DDLElement):
 
 @compiles(CreateViewExpression)
 def generate_view_create_expression(element: CreateViewExpression, compiler: Compiled, **kwargs) -> str:
-    return "CREATE VIEW {} AS {}".format(element.name,
-                                         compiler.sql_compiler.process(element.selectable,
-                                                                       literal_binds=True))
+    selectable = compiler.sql_compiler.process(element.selectable, literal_binds=True)
+    return f"CREATE VIEW {element.name} AS {selectable}"
 
 
 class CreateMaterializedViewExpression(CreateViewExpression):
@@ -55,9 +54,8 @@ class CreateMaterializedViewExpression(CreateViewExpression):
 
 @compiles(CreateMaterializedViewExpression, "postgresql")
 def generate_mview_create_expression(element, compiler: Compiled, **kwargs) -> str:
-    return "CREATE MATERIALIZED VIEW {} AS {}".format(element.name,
-                                                      compiler.sql_compiler.process(element.selectable,
-                                                                                    literal_binds=True))
+    selectable = compiler.sql_compiler.process(element.selectable, literal_binds=True)
+    return f"CREATE MATERIALIZED VIEW {element.name} AS {selectable}"
 
 
 class DropViewExpression(DDLElement):
@@ -67,7 +65,7 @@ class DropViewExpression(DDLElement):
 
 @compiles(DropViewExpression)
 def generate_view_drop_expression(element, compiler: Compiled, **kwargs) -> str:
-    return "DROP VIEW IF EXISTS {}".format(element.name)
+    return f"DROP VIEW IF EXISTS {element.name}"
 
 
 class DropMaterializedViewExpression(DropViewExpression):
@@ -75,7 +73,26 @@ class DropMaterializedViewExpression(DropViewExpression):
 
 @compiles(DropMaterializedViewExpression, "postgresql")
 def generate_mview_drop_expression(element, compiler: Compiled, **kwargs) -> str:
-    return "DROP MATERIZLIZED VIEW IF EXISTS {}".format(element.name)
+    return f"DROP MATERIALIZED VIEW IF EXISTS {element.name}"
+
+
+# Key in MetaData.info of create and drop DDL elements of views registered on it,
+# in order of creation (see: create_view)
+# NOTE: Stored on the MetaData itself (rather than a module-level registry),
+#       as the elements reference the MetaData through their selectables
+_VIEWS_INFO_KEY = "lc_sqlalchemy_dbutils.views"
+
+def _create_views(target: MetaData, connection: Any, **kwargs) -> None:
+    """Create all views registered on target MetaData, in order of creation."""
+    for create_element, _ in target.info.get(_VIEWS_INFO_KEY, ()):
+        create_element(target, connection, **kwargs)
+
+def _drop_views(target: MetaData, connection: Any, **kwargs) -> None:
+    """Drop all views registered on target MetaData, in reverse order of creation
+    (so views are dropped before views they select from).
+    """
+    for _, drop_element in reversed(target.info.get(_VIEWS_INFO_KEY, ())):
+        drop_element(target, connection, **kwargs)
 
 
 def create_view(name: str, selectable: FromClause, metadata: MetaData, materialized: bool = False) -> Table:
@@ -88,6 +105,9 @@ def create_view(name: str, selectable: FromClause, metadata: MetaData, materiali
     Returns:
         Table object bound to temporary MetaData object with columns
         returned from selectable (essentially creates table as view).
+        Views are created after all tables in metadata, in order of creation,
+        and dropped before them in reverse order, by a single pair of
+        event listeners per MetaData object.
         NOTE:
             For non-postgresql backends, creating a materialized view
             will result in a standard view, which cannot be indexed.
@@ -97,102 +117,17 @@ def create_view(name: str, selectable: FromClause, metadata: MetaData, materiali
         N/A
     """
     _tmp_mt = MetaData()
-    tbl = Table(name, _tmp_mt)
-    for column in selectable.c:
-        tbl.append_column(Column(column.name, column.type, primary_key=column.primary_key))
-    listen(metadata,
-           "after_create",
-           (CreateMaterializedViewExpression(name, selectable)
-            if materialized else CreateViewExpression(name, selectable)))
-    listen(metadata,
-           "before_drop",
-           DropMaterializedViewExpression(name) if materialized else DropViewExpression(name))
+    # Build Table with all columns at once, rather than appending columns one at a time
+    tbl = Table(name,
+                _tmp_mt,
+                *[Column(column.name, column.type, primary_key=column.primary_key) for column in selectable.c])
+    # Install view create/drop listeners on first view registered for metadata
+    views: Optional[List[Tuple[DDLElement, DDLElement]]] = metadata.info.get(_VIEWS_INFO_KEY)
+    if views is None:
+        views = metadata.info[_VIEWS_INFO_KEY] = list()
+        listen(metadata, "after_create", _create_views)
+        listen(metadata, "before_drop", _drop_views)
+    views.append(((CreateMaterializedViewExpression(name, selectable)
+                   if materialized else CreateViewExpression(name, selectable)),
+                  DropMaterializedViewExpression(name) if materialized else DropViewExpression(name)))
     return tbl
-
-
-if os.environ.get("ENVIRONMENT") == "TEST":
-    from datetime import datetime
-    import unittest
-
-    from sqlalchemy.engine import create_engine
-    from sqlalchemy.orm import sessionmaker
-    from sqlalchemy.sql import select
-
-    from tests.common import BaseTable, User, Post
-
-
-    PostAuditTimeline = create_view("post_audit_timeline",
-                                    select([User.id, User.first_name, Post.created_at], order_by=Post.created_at),
-                                    BaseTable.metadata)
-
-
-    class TestViewUtilities(unittest.TestCase):
-        """Tests for view creation/drop utilities."""
-
-        def setUp(self):
-            # Create SQLAlchemy engine for in-memory SQLite database
-            # See: https://docs.sqlalchemy.org/en/13/core/engines.html#sqlite
-            self.engine = create_engine("sqlite://")
-            # Create all tables in database
-            BaseTable.metadata.create_all(self.engine)
-            # Bind sessionmaker instance to engine
-            self.session_factory = sessionmaker(bind=self.engine)
-            # Create session
-            self.session = self.session_factory()
-
-        def test_create_view_expression_single_table(self):
-            """Test that view creation query compiles correctly
-            where view selects from a single table.
-            """
-            # Create view query
-            view_query = select([User.id, User.first_name, User.last_name])
-            # Set expected output
-            ddl_statement = ("CREATE VIEW user_names AS "
-                             "SELECT \"user\".id, \"user\".first_name, \"user\".last_name FROM \"user\"")
-            # NOTE: have to remove newline because SQLAlchemy's select inserts them by default
-            self.assertEqual(ddl_statement,
-                             str(CreateViewExpression("user_names", view_query)).replace("\n", ""))
-
-        def test_create_view_expression_join(self):
-            """Test that view creation query compiles correctly
-            where view selects from two tables (with join).
-            """
-            # Create view query
-            view_query = select([
-                User.id,
-                (User.first_name + User.last_name).label("full_name"),
-                Post.content
-            ])
-            ddl_statement = ("CREATE VIEW user_posts AS "
-                             "SELECT \"user\".id, \"user\".first_name || \"user\".last_name AS full_name, post.content "
-                             "FROM \"user\", post")
-            self.assertEqual(ddl_statement,
-                             str(CreateViewExpression("user_posts", view_query)).replace("\n", ""))
-
-        def test_drop_view_expression_single_table(self):
-            """Test that drop view query compiles correctly."""
-            self.assertEqual("DROP VIEW IF EXISTS user_names", str(DropViewExpression("user_names")))
-
-        def test_select_from_created_view(self):
-            """Test that PostAuditTimeline was created in database and
-            has the right columns by:
-                1) Adding a User record
-                2) Adding a Post record tied to User
-                3) Selecting from view
-            """
-            # Add User record to database
-            user = User(first_name="Susan", last_name="Sarandon", email="susan.sarandon@gmail.com")
-            # NOTE: Pylint doesn't see these methods on Session type
-            self.session.add(user)  # pylint: disable=E1101
-            self.session.commit()   # pylint: disable=E1101
-            # Add Post record to database
-            created_at_datetime = datetime.utcnow()
-            post = Post(user_id=user.id, content="<h1>This is a post</h1>", created_at=created_at_datetime)
-            self.session.add(post)  # pylint: disable=E1101
-            self.session.commit()   # pylint: disable=E1101
-            # Select records from post_audit_timeline and ensure match up with records in database
-            self.assertEqual([(1, "Susan", created_at_datetime)], self.session.query(PostAuditTimeline).all())  # pylint: disable=E1101
-
-        def tearDown(self):
-            self.session.close()    # pylint: disable=E1101
-            self.engine.dispose()
@@ -38,6 +38,8 @@ else
 fi
 
 echo "::: INFO: Removing tests from ${@}"
-find "${@}" -type f -exec $COMMAND -i'' -n "/${PATTERN}/q;p" {} \; \
+# NOTE: Only modify files with (inline) tests, as the trailing lines of each file are removed
+find "${@}" -type f -exec grep -qF "${PATTERN}" {} \; \
+    -exec $COMMAND -i'' -n "/${PATTERN}/q;p" {} \; \
     -exec $COMMAND -i'' '$d' {} \; \
     -exec $COMMAND -i'' '$d' {} \;
@@ -29,6 +29,7 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 
 __author__ = "libcommon"
@@ -56,3 +57,24 @@ class Post(BaseTable):  # type: ignore
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False)
     content = Column(Text, nullable=False)
     created_at = Column(DateTime, nullable=False)
+
+    user = relationship("User")
+
+
+class Employee(BaseTable):  # type: ignore
+    __tablename__ = "employee"
+
+    id = Column(Integer, primary_key=True)
+    type = Column(Text, nullable=False)
+    name = Column(Text, nullable=False)
+
+    __mapper_args__ = {"polymorphic_identity": "employee", "polymorphic_on": type}
+
+
+class Engineer(Employee):  # type: ignore
+    __tablename__ = "engineer"
+
+    id = Column(Integer, ForeignKey("employee.id"), primary_key=True)
+    language = Column(Text, nullable=False)
+
+    __mapper_args__ = {"polymorphic_identity": "engineer"}
@@ -0,0 +1,60 @@
+## -*- coding: UTF-8 -*-
+## test_schema.py
+## Copyright (c) 2020 libcommon
+##
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+import unittest
+
+from sqlalchemy.dialects import mssql, mysql, oracle, postgresql, sqlite
+from sqlalchemy.engine.default import DefaultDialect
+
+from lc_sqlalchemy_dbutils.schema import TimestampDefaultExpression
+
+
+__author__ = "libcommon"
+
+
+class TestTimestampDefaultExpression(unittest.TestCase):
+    """Tests for TimestampDefaultExpression compilation."""
+
+    def test_compile_by_dialect(self):
+        """Test that expression is compiled to the dialect's UTC timestamp function."""
+        for dialect, expected in ((mssql.dialect(), "GETUTCDATE()"),
+                                  (mysql.dialect(), "UTC_TIMESTAMP()"),
+                                  (oracle.dialect(), "SYS_EXTRACT_UTC(SYSTIMESTAMP)"),
+                                  (postgresql.dialect(), "(NOW() AT TIME ZONE 'UTC')"),
+                                  (sqlite.dialect(), "CURRENT_TIMESTAMP")):
+            with self.subTest(test_name=dialect.name):
+                self.assertEqual(expected, str(TimestampDefaultExpression().compile(dialect=dialect)))
+
+    def test_cache_key(self):
+        """Test that expression is cacheable by SQLAlchemy's compiled statement cache (SQLAlchemy 1.4+)."""
+        if not hasattr(TimestampDefaultExpression, "_generate_cache_key"):
+            self.skipTest("Compiled statement cache requires SQLAlchemy 1.4+")
+        self.assertEqual(TimestampDefaultExpression()._generate_cache_key(),
+                         TimestampDefaultExpression()._generate_cache_key())
+        self.assertIsNotNone(TimestampDefaultExpression()._generate_cache_key())
+
+    def test_compile_fallback(self):
+        """Test that unlisted dialects fall back to CURRENT_TIMESTAMP, and warn
+        that it may not be UTC.
+        """
+        with self.assertWarns(RuntimeWarning):
+            self.assertEqual("CURRENT_TIMESTAMP", str(TimestampDefaultExpression().compile(dialect=DefaultDialect())))
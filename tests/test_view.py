@@ -0,0 +1,157 @@
+## -*- coding: UTF-8 -*-
+## test_view.py
+## Copyright (c) 2020 libcommon
+##
+## Permission is hereby granted, free of charge, to any person obtaining a copy
+## of this software and associated documentation files (the "Software"), to deal
+## in the Software without restriction, including without limitation the rights
+## to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+## copies of the Software, and to permit persons to whom the Software is
+## furnished to do so, subject to the following conditions:
+##
+## The above copyright notice and this permission notice shall be included in all
+## copies or substantial portions of the Software.
+##
+## THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+## IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+## FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+## AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+## LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+## OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+## SOFTWARE.
+
+from datetime import datetime
+import gc
+import unittest
+from unittest.mock import patch
+from weakref import ref
+
+from sqlalchemy import Column, Integer
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.engine import create_engine
+from sqlalchemy.event import contains
+from sqlalchemy.schema import MetaData, Table
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.sql import select
+
+from lc_sqlalchemy_dbutils.view import (
+    _create_views,
+    _drop_views,
+    create_view,
+    CreateViewExpression,
+    DropMaterializedViewExpression,
+    DropViewExpression,
+)
+from tests.common import BaseTable, User, Post
+
+
+__author__ = "libcommon"
+
+
+PostAuditTimeline = create_view("post_audit_timeline",
+                                select([User.id, User.first_name, Post.created_at], order_by=Post.created_at),
+                                BaseTable.metadata)
+
+
+class TestViewUtilities(unittest.TestCase):
+    """Tests for view creation/drop utilities."""
+
+    def setUp(self):
+        # Create SQLAlchemy engine for in-memory SQLite database
+        # See: https://docs.sqlalchemy.org/en/13/core/engines.html#sqlite
+        self.engine = create_engine("sqlite://")
+        # Create all tables in (empty) database without checking if they exist first
+        BaseTable.metadata.create_all(self.engine, checkfirst=False)
+        # Bind sessionmaker instance to engine
+        self.session_factory = sessionmaker(bind=self.engine)
+        # Create session
+        self.session = self.session_factory()
+
+    def test_create_view_expression_single_table(self):
+        """Test that view creation query compiles correctly
+        where view selects from a single table.
+        """
+        # Create view query
+        view_query = select([User.id, User.first_name, User.last_name])
+        # Set expected output
+        ddl_statement = ("CREATE VIEW user_names AS "
+                         "SELECT \"user\".id, \"user\".first_name, \"user\".last_name FROM \"user\"")
+        # NOTE: have to remove newline because SQLAlchemy's select inserts them by default
+        self.assertEqual(ddl_statement,
+                         str(CreateViewExpression("user_names", view_query)).replace("\n", ""))
+
+    def test_create_view_expression_join(self):
+        """Test that view creation query compiles correctly
+        where view selects from two tables (with join).
+        """
+        # Create view query
+        view_query = select([
+            User.id,
+            (User.first_name + User.last_name).label("full_name"),
+            Post.content
+        ])
+        ddl_statement = ("CREATE VIEW user_posts AS "
+                         "SELECT \"user\".id, \"user\".first_name || \"user\".last_name AS full_name, post.content "
+                         "FROM \"user\", post")
+        self.assertEqual(ddl_statement,
+                         str(CreateViewExpression("user_posts", view_query)).replace("\n", ""))
+
+    def test_drop_view_expression_single_table(self):
+        """Test that drop view query compiles correctly."""
+        self.assertEqual("DROP VIEW IF EXISTS user_names", str(DropViewExpression("user_names")))
+
+    def test_drop_materialized_view_expression_postgresql(self):
+        """Test that drop materialized view query compiles correctly for PostgreSQL."""
+        self.assertEqual("DROP MATERIALIZED VIEW IF EXISTS user_names",
+                         str(DropMaterializedViewExpression("user_names").compile(dialect=postgresql.dialect())))
+
+    def test_create_drop_views_single_listener(self):
+        """Test that views registered on the same MetaData share a single pair of
+        listeners, which create views in order and drop them in reverse order.
+        """
+        metadata = MetaData()
+        numbers = Table("numbers", metadata, Column("value", Integer, primary_key=True))
+        small_numbers = create_view("small_numbers", select([numbers.c.value]).where(numbers.c.value < 10), metadata)
+        create_view("tiny_numbers", select([small_numbers.c.value]).where(small_numbers.c.value < 3), metadata)
+        for event_name, listener in (("after_create", _create_views), ("before_drop", _drop_views)):
+            with self.subTest(test_name=event_name):
+                self.assertTrue(contains(metadata, event_name, listener))
+        metadata.create_all(self.engine)
+        with patch.object(self.engine.dialect, "do_execute", wraps=self.engine.dialect.do_execute) as execute_mock:
+            metadata.drop_all(self.engine)
+            statements = [args[1] for args, _ in execute_mock.call_args_list if args[1].startswith("DROP VIEW")]
+        self.assertEqual(["DROP VIEW IF EXISTS tiny_numbers", "DROP VIEW IF EXISTS small_numbers"], statements)
+
+    def test_create_view_metadata_collectable(self):
+        """Test that registering views on MetaData doesn't keep it alive."""
+        metadata = MetaData()
+        numbers = Table("numbers", metadata, Column("value", Integer, primary_key=True))
+        create_view("small_numbers", select([numbers.c.value]).where(numbers.c.value < 10), metadata)
+        metadata_ref = ref(metadata)
+        del metadata, numbers
+        gc.collect()
+        self.assertIsNone(metadata_ref())
+
+    def test_select_from_created_view(self):
+        """Test that PostAuditTimeline was created in database and
+        has the right columns by:
+            1) Adding a User record
+            2) Adding a Post record tied to User
+            3) Selecting from view
+        """
+        # Add User record to database
+        user = User(first_name="Susan", last_name="Sarandon", email="susan.sarandon@gmail.com")
+        # NOTE: Pylint doesn't see these methods on Session type
+        self.session.add(user)  # pylint: disable=E1101
+        self.session.commit()   # pylint: disable=E1101
+        # Add Post record to database
+        created_at_datetime = datetime.utcnow()
+        post = Post(user_id=user.id, content="<h1>This is a post</h1>", created_at=created_at_datetime)
+        self.session.add(post)  # pylint: disable=E1101
+        self.session.commit()   # pylint: disable=E1101
+        # Select records from post_audit_timeline and ensure match up with records in database
+        self.assertEqual([(1, "Susan", created_at_datetime)], self.session.query(PostAuditTimeline).all())  # pylint: disable=E1101
+
+    def tearDown(self):
+        self.session.close()    # pylint: disable=E1101
+        self.engine.dispose()